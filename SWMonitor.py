@@ -1,24 +1,94 @@
 import subprocess
-import concurrent.futures
+import asyncio
+import itertools
+import socket
+import struct
+import zlib
 import time
 import re
 import platform
+import errno
+import sys
 import configparser
 import os
 import logging
 import csv
-import chardet
+import math
+import dataclasses
+import functools
+import shutil
+import mmap
+import array
+import json
+import codecs
+
+try:
+    # 可选依赖：pip install faust-cchardet，C 实现的编码检测
+    import cchardet
+except ImportError:
+    cchardet = None
+
+try:
+    # 可选依赖：pip install liburing，用于在 Linux 上通过 io_uring 批量提交 ICMP 请求
+    import liburing
+except ImportError:
+    liburing = None
 
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
     handlers=[
-        logging.FileHandler("ping_monitor.log"),  # 日志写入文件
+        logging.FileHandler("ping_monitor.log", mode="w", encoding="utf-8"),  # 日志写入文件，每次启动时清空
         logging.StreamHandler()  # 日志输出到控制台
     ]
 )
 
+# 运行平台及对应的 ping 输出解析规则，在模块加载时确定
+IS_WINDOWS = platform.system() == "Windows"
+# ping 输出以字节形式解析，中文 Windows 控制台输出为 GBK 编码。
+# 每条应答行一次匹配同时取出响应时间和 TTL：
+#   Windows:     来自 x.x.x.x 的回复: 字节=32 时间=1ms TTL=64（小于 1ms 时显示为 时间<1ms）
+#   Linux/macOS: 64 bytes from x.x.x.x: icmp_seq=1 ttl=64 time=0.045 ms
+if IS_WINDOWS:
+    PING_REPLY_RE = re.compile(r"时间[=<](?P<time>\d+)ms TTL=(?P<ttl>\d+)".encode("gbk"))
+else:
+    PING_REPLY_RE = re.compile(rb"ttl=(?P<ttl>\d+) time=(?P<time>[\d.]+) ms", re.IGNORECASE)
+# fping -q 输出的每台主机的统计行，例如：
+#   10.0.0.1 : xmt/rcv/%loss = 3/3/0%, min/avg/max = 0.03/0.04/0.05
+#   10.0.0.2 : xmt/rcv/%loss = 3/0/100%
+FPING_SUMMARY_RE = re.compile(
+    rb"^(?P<host>\S+)\s+: xmt/rcv/%loss = \d+/(?P<rcv>\d+)/\d+%(?:, min/avg/max = [\d.]+/(?P<avg>[\d.]+)/[\d.]+)?",
+    re.MULTILINE
+)
+
+# ICMP 报文类型
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+# Linux 下 IP_RECVTTL / IP_TTL 的取值（部分 Python 版本未导出该常量）
+IP_RECVTTL = getattr(socket, "IP_RECVTTL", 12)
+IP_TTL = getattr(socket, "IP_TTL", 2)
+# ICMP 回显请求的负载，与系统 ping 默认的 56 字节保持一致
+ICMP_PAYLOAD = b"SWMonitor".ljust(56, b"\x00")
+
+# io_uring 批量 Ping 所需的最低内核版本（带目标地址的 IORING_OP_SEND 和
+# IORING_ASYNC_CANCEL_FD_FIXED 均需 6.0，此时也已支持无特权的 SQPOLL）
+IO_URING_MIN_KERNEL = (6, 0)
+# io_uring 请求的 user_data 低 2 位表示请求类型，其余位为主机/缓冲区下标
+URING_OP_SEND = 0
+URING_OP_RECV = 1
+URING_OP_CANCEL = 2
+# ICMP 套接字的接收缓冲区大小
+ICMP_RCVBUF_SIZE = 4 * 1024 * 1024
+
+# 编码检测只读取文件开头的样本
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# 等待回复的 ICMP 请求：(IP, 序列号) -> (标识符, Future)
+_icmp_waiters = {}
+# 全局递增的 ICMP 序列号，保证同一时刻每个请求的 (IP, 序列号) 唯一
+_icmp_sequence = itertools.count()
+
 # 从配置文件中读取配置
 def load_config(filename):
     config = configparser.ConfigParser()
@@ -27,34 +97,148 @@ def load_config(filename):
         config.read_file(f)
     return config
 
-# 检测文件编码
+# 检测文件编码，只检查文件开头的样本
 def detect_file_encoding(filename):
     with open(filename, "rb") as f:
-        raw_data = f.read()
-        result = chardet.detect(raw_data)
-        return result.get("encoding", "utf-8")
+        if os.fstat(f.fileno()).st_size == 0:
+            return "utf-8"  # 空文件无法映射
+        # 通过内存映射只取开头的样本，不经过文件对象的读缓冲区
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            sample = mm[:ENCODING_SAMPLE_SIZE]
+
+    # 带 BOM 的文件可以直接确定编码
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+
+    # 纯 ASCII 内容（UTF-8 是其超集，样本之后出现的非 ASCII 字符也能正确读取）
+    if sample.isascii():
+        return "utf-8"
+
+    # 样本可以按 UTF-8 解码（末尾被截断的多字节字符除外）
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    if cchardet is not None:
+        return cchardet.detect(sample).get("encoding") or "gb18030"
+    # 未安装 cchardet 时按中文 Windows 下 Excel 导出的 GBK 编码处理
+    return "gb18030"
+
+# 主机表：按列存储主机名称、IP 及各主机的检测状态，同一主机在各列中的下标相同
+@dataclasses.dataclass(frozen=True)
+class HostTable:
+    hostnames: tuple
+    ips: tuple
+    failures: array.array     # 连续监测失败次数（uint32）
+    last_ttl: array.array     # 最近一次应答的 TTL（uint8，0 表示未知）
+    last_rtt_ms: array.array  # 最近一次平均响应时间（float32，NaN 表示未知）
+
+    @classmethod
+    def from_hosts(cls, hosts):
+        hostnames = tuple(hostname for hostname, _ in hosts)
+        ips = tuple(ip for _, ip in hosts)
+        count = len(ips)
+        return cls(
+            hostnames=hostnames,
+            ips=ips,
+            failures=array.array("I", bytes(4 * count)),
+            last_ttl=array.array("B", bytes(count)),
+            last_rtt_ms=array.array("f", [math.nan]) * count,
+        )
 
-# 从当前目录下的 iplist.csv 文件中读取主机名称和 IP 地址
+    def __len__(self):
+        return len(self.ips)
+
+    # 记录一次检测结果：可达时重置失败次数并保存响应时间和 TTL，不可达时失败次数加 1
+    def record(self, index, reachable, details):
+        if reachable:
+            self.failures[index] = 0
+            response_time = details.get("response_time")
+            ttl = details.get("ttl")
+            self.last_rtt_ms[index] = response_time if isinstance(response_time, (int, float)) else math.nan
+            self.last_ttl[index] = ttl if isinstance(ttl, int) else 0
+        else:
+            self.failures[index] += 1
+
+    # 重新加载主机列表后，从旧表中继承仍然存在的主机（主机名称和 IP 均相同）的检测状态
+    def carry_over(self, old):
+        old_indexes = {host: index for index, host in enumerate(zip(old.hostnames, old.ips))}
+        for index, host in enumerate(zip(self.hostnames, self.ips)):
+            old_index = old_indexes.get(host)
+            if old_index is not None:
+                self.failures[index] = old.failures[old_index]
+                self.last_ttl[index] = old.last_ttl[old_index]
+                self.last_rtt_ms[index] = old.last_rtt_ms[old_index]
+
+# 获取文件的修改时间（纳秒），文件不存在时返回 None
+def ip_list_mtime_ns(filename):
+    try:
+        return os.stat(filename).st_mtime_ns
+    except OSError:
+        return None
+
+# 从当前目录下的 iplist.csv 文件中读取主机名称和 IP 地址，返回 HostTable
 def load_ips_from_csv(filename):
-    ip_list = []
     try:
         # 检测文件编码
         encoding = detect_file_encoding(filename)
-        with open(filename, "r", encoding=encoding) as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                hostname = row.get("主机名称")
-                ip = row.get("IP地址")
-                if hostname and ip:
-                    ip_list.append((hostname, ip))
-        return ip_list
+        with open(filename, "r", encoding=encoding, newline="") as file:
+            reader = csv.reader(file)
+            header = next(reader, [])
+            # 只在表头中定位一次列位置
+            hostname_index = header.index("主机名称")
+            ip_index = header.index("IP地址")
+            min_length = max(hostname_index, ip_index) + 1
+            return HostTable.from_hosts([
+                (row[hostname_index], row[ip_index])
+                for row in reader
+                if len(row) >= min_length and row[hostname_index] and row[ip_index]
+            ])
     except Exception as e:
         logging.error(f"读取文件 {filename} 时发生错误: {e}")
-        return []
+        return HostTable.from_hosts([])
+
+# 通过常驻的 PushBot 进程推送消息，每行一条 JSON：{"platform": ..., "message": ...}
+def push_to_persistent_bot(bot_exe, platform_name, message):
+    line = json.dumps({"platform": platform_name, "message": message}, ensure_ascii=False) + "\n"
+    # 写入失败（进程已退出或管道已断开）时重新启动进程，并重试一次
+    for attempt in range(2):
+        # 首次调用或进程已退出时启动 PushBot，之后各次告警复用同一进程
+        process = getattr(push_to_persistent_bot, "process", None)
+        if process is None or process.poll() is not None:
+            try:
+                process = subprocess.Popen(
+                    [bot_exe], stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+            except OSError as e:
+                # 例如 PushBot 没有执行权限，与非常驻方式一样只记录错误，不中断监测
+                logging.error(f"启动 {bot_exe} 时出错: {e}")
+                return
+            push_to_persistent_bot.process = process
+
+        try:
+            process.stdin.write(line.encode("utf-8"))
+            process.stdin.flush()
+        except OSError as e:
+            # 结束无法写入的旧进程，避免与重新启动的进程同时运行
+            process.kill()
+            process.wait()
+            push_to_persistent_bot.process = None
+            if attempt == 0:
+                logging.warning(f"向 {bot_exe} 写入消息时出错，重新启动后重试: {e}")
+            else:
+                logging.error(f"向 {bot_exe} 写入消息时出错: {e}")
+            continue
+        logging.info(f"{platform_name} 消息已发送至 {bot_exe}")
+        return
 
-# 调用 PushBot.exe 进行消息推送
-def call_bot_exe(platform_name, message):
-    if platform.system() == "Windows":
+# 调用 PushBot.exe 进行消息推送，persistent 为 True 时复用常驻的 PushBot 进程
+def call_bot_exe(platform_name, message, persistent=False):
+    if IS_WINDOWS:
         # Windows 环境：调用 PushBot.exe
         bot_exe = "PushBot.exe"
     else:
@@ -66,6 +250,10 @@ def call_bot_exe(platform_name, message):
         logging.error(f"找不到 {bot_exe}，请将 {bot_exe} 程序放至本程序目录后再重新运行本程序。")
         return  # 退出，不再尝试调用 PushBot
 
+    if persistent:
+        push_to_persistent_bot(bot_exe, platform_name, message)
+        return
+
     # 构建命令
     command = [bot_exe, platform_name, message]
 
@@ -79,125 +267,598 @@ def call_bot_exe(platform_name, message):
         logging.exception(f"执行过程中发生异常: {e}")
 
 # 推送告警消息
-def send_alert(alert_list, platforms):
+async def send_alert(alert_list, platforms, persistent_bot=False):
     if not alert_list:
         return  # 如果没有告警，直接返回
 
-    # 动态计算列宽
-    hostname_width = max(len("设备名称"), max(len(hostname) for hostname, _, _ in alert_list))
-    ip_width = max(len("设备IP地址"), max(len(ip) for _, ip, _ in alert_list))
-    count_width = max(len("监测失败次数"), max(len(str(count)) for _, _, count in alert_list))
-
-    # 构造推送消息模板
-    message = "本次监控系统检测到以下设备不可达，请及时检查：\n"
-    message += "-" * (hostname_width + ip_width + count_width + 35) + "\n"
-    message += (
+    # 动态计算列宽，一次遍历同时得到三列宽度，并缓存失败次数的字符串形式
+    hostname_width, ip_width, count_width = len("设备名称"), len("设备IP地址"), len("监测失败次数")
+    rows = []
+    for hostname, ip, failure_count in alert_list:
+        count_text = str(failure_count)
+        hostname_width = max(hostname_width, len(hostname))
+        ip_width = max(ip_width, len(ip))
+        count_width = max(count_width, len(count_text))
+        rows.append((hostname, ip, count_text))
+
+    # 构造推送消息模板，各部分先放入列表再一次性拼接
+    separator = "-" * (hostname_width + ip_width + count_width + 35) + "\n"
+    parts = [
+        "本次监控系统检测到以下设备不可达，请及时检查：\n",
+        separator,
         f"{'设备名称'.ljust(hostname_width)}  "
         f"{'设备IP地址'.ljust(ip_width)}  "
-        f"{'监测失败次数'.center(count_width)}\n"
-    )
-    message += "-" * (hostname_width + ip_width + count_width + 35) + "\n"
-    for hostname, ip, failure_count in alert_list:
-        message += (
+        f"{'监测失败次数'.center(count_width)}\n",
+        separator,
+    ]
+    for hostname, ip, count_text in rows:
+        parts.append(
             f"{hostname.ljust(hostname_width)}  "
             f"{ip.ljust(ip_width)}  "
-            f"{str(failure_count).center(count_width)}\n"
+            f"{count_text.center(count_width)}\n"
         )
-    message += "-" * (hostname_width + ip_width + count_width + 35) + "\n"
-    message += f"告警时间：{time.strftime('%Y-%m-%d %H:%M:%S')}"
+    parts.append(separator)
+    parts.append(f"告警时间：{time.strftime('%Y-%m-%d %H:%M:%S')}")
+    message = "".join(parts)
 
     # 根据启用的推送平台调用 PushBot
-    for platform_name in platforms:
-        call_bot_exe(platform_name, message)
-
-def ping_ip(ip, ping_count, ping_timeout):
-    # 根据操作系统选择 ping 命令参数
-    if platform.system().lower() == "windows":
-        ping_args = ["ping", "-n", str(ping_count), "-w", str(ping_timeout), ip]
+    if persistent_bot:
+        # 常驻进程共用同一个标准输入管道，在线程中按顺序写入，管道写满时不会阻塞事件循环
+        for platform_name in platforms:
+            push = asyncio.ensure_future(asyncio.to_thread(call_bot_exe, platform_name, message, persistent_bot))
+            try:
+                await asyncio.wait_for(asyncio.shield(push), 30)
+            except asyncio.TimeoutError:
+                # PushBot 长时间不读取消息，结束该进程使写入失败，由 push_to_persistent_bot 重新启动后重试
+                logging.error(f"向 PushBot 推送 {platform_name} 消息超时，将重新启动 PushBot。")
+                process = getattr(push_to_persistent_bot, "process", None)
+                if process is not None:
+                    process.kill()
+                await push
     else:
-        ping_args = ["ping", "-c", str(ping_count), "-W", str(ping_timeout // 1000), ip]
+        # 各平台的 PushBot 在线程中并行执行，总耗时取决于最慢的平台
+        await asyncio.gather(
+            *[asyncio.to_thread(call_bot_exe, platform_name, message) for platform_name in platforms]
+        )
 
-    # 使用 ping 命令检测 IP 是否可达
-    result = subprocess.run(ping_args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    output = result.stdout
+# 根据操作系统构建 ping 命令参数（不含目标 IP），相同配置只构建一次，各主机、各监测周期共用
+@functools.lru_cache(maxsize=None)
+def ping_argv_prefix(ping_count, ping_timeout):
+    if IS_WINDOWS:
+        return ("ping", "-n", str(ping_count), "-w", str(ping_timeout))
+    return ("ping", "-c", str(ping_count), "-W", str(ping_timeout // 1000))
+
+async def ping_ip(argv_prefix, ip):
+    # 使用 ping 命令检测 IP 是否可达，输出保持为字节，只解析其中的数字字段
+    process = await asyncio.create_subprocess_exec(
+        *argv_prefix, ip, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    output, _ = await process.communicate()
 
     # 解析 ping 的输出
-    reachable = result.returncode == 0
+    reachable = process.returncode == 0
     details = {}
 
     if reachable:
-        # 提取响应时间
-        if platform.system().lower() == "windows":
-            time_matches = re.findall(r"时间=(\d+)ms", output)  # Windows 格式
-        else:
-            time_matches = re.findall(r"time=([\d.]+) ms", output)  # Linux/macOS 格式
-
-        if time_matches:
-            response_times = [float(t) for t in time_matches]
+        # 单次扫描输出，取响应时间的平均值和最后一条应答的 TTL
+        response_times = []
+        ttl = "未知"
+        for match in PING_REPLY_RE.finditer(output):
+            response_times.append(float(match.group("time")))
+            ttl = int(match.group("ttl"))
+
+        if response_times:
             details["response_time"] = int(sum(response_times) / len(response_times))  # 平均响应时间（取整）
         else:
             details["response_time"] = "未知"
+        details["ttl"] = ttl
 
-        # 提取 TTL
-        if platform.system().lower() == "windows":
-            ttl_match = re.search(r"TTL=(\d+)", output)  # Windows 格式
-        else:
-            ttl_match = re.search(r"ttl=(\d+)", output, re.IGNORECASE)  # Linux/macOS 格式
+    return ip, reachable, details
 
-        if ttl_match:
-            details["ttl"] = int(ttl_match.group(1))  # TTL 值
+# 计算 ICMP 校验和（RFC 1071）
+def icmp_checksum(data):
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+# 构造 ICMP 回显请求报文
+def build_icmp_echo(identifier, sequence, payload=ICMP_PAYLOAD):
+    header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, identifier, sequence)
+    checksum = icmp_checksum(header + payload)
+    return struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, identifier, sequence) + payload
+
+# 创建用于 Ping 的 ICMP 套接字，不支持时返回 None（退回到系统 ping 命令）
+def open_icmp_socket():
+    if IS_WINDOWS:
+        return None
+
+    # 优先使用无需特权的 ICMP 数据报套接字（需 net.ipv4.ping_group_range 包含当前用户组），
+    # 其次使用原始套接字（需要 root 或 CAP_NET_RAW 权限）
+    for sock_type in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+        try:
+            sock = socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP)
+        except OSError:
+            continue
+        sock.setblocking(False)
+        # 批量发送后应答会集中到达，增大接收缓冲区以免丢包（实际大小受 net.core.rmem_max 限制）
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, ICMP_RCVBUF_SIZE)
+        if sock_type == socket.SOCK_DGRAM:
+            # 数据报套接字收不到 IP 头，通过辅助数据获取 TTL
+            sock.setsockopt(socket.IPPROTO_IP, IP_RECVTTL, 1)
+        return sock
+    return None
+
+# 解析收到的 ICMP 回显应答，返回 (标识符, 序列号, TTL)，不是回显应答时返回 None
+def parse_icmp_reply(sock, data, ancdata):
+    if sock.type == socket.SOCK_RAW:
+        # 原始套接字收到的数据包含 IP 头，TTL 位于 IP 头第 8 个字节
+        ttl = data[8]
+        data = data[(data[0] & 0x0F) * 4:]
+    else:
+        ttl = None
+        for level, cmsg_type, cmsg_data in ancdata:
+            if level == socket.IPPROTO_IP and cmsg_type == IP_TTL:
+                ttl = int.from_bytes(cmsg_data[:4], sys.byteorder)
+
+    if len(data) < 8:
+        return None
+    icmp_type, _, _, identifier, sequence = struct.unpack("!BBHHH", data[:8])
+    if icmp_type != ICMP_ECHO_REPLY:
+        return None
+    return identifier, sequence, ttl
+
+# 读取 ICMP 套接字上的所有应答，并唤醒对应的等待者
+def _on_icmp_readable(sock):
+    while True:
+        try:
+            data, ancdata, _, address = sock.recvmsg(2048, socket.CMSG_SPACE(4))
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            logging.error("读取 ICMP 应答时发生错误: %s", e)
+            return
+
+        reply = parse_icmp_reply(sock, data, ancdata)
+        if reply is None:
+            continue
+        identifier, sequence, ttl = reply
+        waiter = _icmp_waiters.get((address[0], sequence))
+        if waiter is None:
+            continue
+        expected_identifier, future = waiter
+        # 数据报套接字的标识符由内核改写，只有原始套接字需要校验
+        if sock.type == socket.SOCK_RAW and identifier != expected_identifier:
+            continue
+        if not future.done():
+            future.set_result((time.perf_counter(), ttl))
+
+# 套接字可写时唤醒所有等待发送的任务
+def _on_icmp_writable(loop, sock, future):
+    loop.remove_writer(sock.fileno())
+    if not future.done():
+        future.set_result(None)
+
+# 通过非阻塞的 ICMP 套接字发送报文，发送缓冲区已满时等待套接字可写后重试
+# （loop.sock_sendto 需要 Python 3.11 及以上版本，这里不依赖它）
+async def _icmp_sendto(loop, sock, packet, address):
+    while True:
+        try:
+            return sock.sendto(packet, address)
+        except (BlockingIOError, InterruptedError):
+            pass
+        # add_writer 对同一描述符只保留一个回调，所有等待发送的任务共用同一个 Future
+        future = getattr(_icmp_sendto, "writable", None)
+        if future is None or future.done():
+            future = loop.create_future()
+            _icmp_sendto.writable = future
+            loop.add_writer(sock.fileno(), _on_icmp_writable, loop, sock, future)
+        await asyncio.shield(future)
+
+# 将主机列表中的地址（IP 或主机名）解析为 IPv4 地址，解析失败时为 None。
+# ICMP 应答的来源是数值地址，主机名每个监测周期重新解析（与系统 ping 一致），IP 地址无需解析
+async def resolve_ipv4(ips):
+    loop = asyncio.get_running_loop()
+    resolved = {}
+    names = []
+    for ip in ips:
+        if ip in resolved:
+            continue
+        try:
+            socket.inet_pton(socket.AF_INET, ip)
+            resolved[ip] = ip
+        except (OSError, UnicodeError):
+            resolved[ip] = None
+            names.append(ip)
+
+    # 主机名在线程池中并发解析，不阻塞事件循环
+    lookups = await asyncio.gather(
+        *[loop.getaddrinfo(name, None, family=socket.AF_INET, type=socket.SOCK_DGRAM) for name in names],
+        return_exceptions=True
+    )
+    for name, result in zip(names, lookups):
+        if isinstance(result, (OSError, UnicodeError)):
+            logging.warning(f"无法解析主机地址 {name}，本轮视为不可达: {result}")
+        elif isinstance(result, BaseException):
+            raise result
         else:
-            details["ttl"] = "未知"
+            resolved[name] = result[0][4][0]
+    return tuple(resolved[ip] for ip in ips)
+
+# 使用共享的 ICMP 套接字异步 Ping 指定 IP，address 为解析后的 IPv4 地址
+async def ping_ip_async(sock, ip, address, ping_count, ping_timeout):
+    if address is None:
+        return ip, False, {}  # 无法解析的地址，视为不可达
+
+    loop = asyncio.get_running_loop()
+    identifier = zlib.crc32(address.encode()) & 0xFFFF
+    response_times = []
+    ttl = None
+
+    for _ in range(ping_count):
+        sequence = next(_icmp_sequence) & 0xFFFF
+        future = loop.create_future()
+        _icmp_waiters[(address, sequence)] = (identifier, future)
+        try:
+            send_time = time.perf_counter()
+            await _icmp_sendto(loop, sock, build_icmp_echo(identifier, sequence), (address, 0))
+            recv_time, ttl = await asyncio.wait_for(future, ping_timeout / 1000)
+            response_times.append((recv_time - send_time) * 1000)
+        except (asyncio.TimeoutError, OSError):
+            continue
+        finally:
+            _icmp_waiters.pop((address, sequence), None)
+
+    reachable = bool(response_times)
+    details = {}
+    if reachable:
+        details["response_time"] = int(sum(response_times) / len(response_times))  # 平均响应时间（取整）
+        details["ttl"] = ttl if ttl is not None else "未知"
 
     return ip, reachable, details
 
-def monitor_ips(ip_list, platforms, ping_count, ping_timeout, failure_threshold):
-    # 使用全局变量记录每个 IP 的失败次数（跨监测周期）
-    if not hasattr(monitor_ips, "failure_count"):
-        monitor_ips.failure_count = {ip: 0 for _, ip in ip_list}
+# 获取当前 Linux 内核的主次版本号
+def kernel_version():
+    match = re.match(r"(\d+)\.(\d+)", platform.release())
+    return (int(match.group(1)), int(match.group(2))) if match else (0, 0)
 
-    alert_list = []  # 用于存储需要告警的主机信息
+# 判断是否可以使用 io_uring 批量 Ping
+def io_uring_available():
+    return liburing is not None and sys.platform.startswith("linux") and kernel_version() >= IO_URING_MIN_KERNEL
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=50) as executor:
-        # 并发执行 Ping 操作
-        future_to_host = {
-            executor.submit(ping_ip, ip, ping_count, ping_timeout): (hostname, ip)
-            for hostname, ip in ip_list
-        }
+# 读取 CQE 的返回值，liburing 对负值结果会直接抛出 OSError
+def _uring_cqe_result(entry):
+    try:
+        return entry.res
+    except OSError as e:
+        return -e.errno
+
+# 从 io_uring 提交队列获取一个 SQE，队列已满时先提交已有请求
+def _uring_get_sqe(ring):
+    sqe = liburing.io_uring_get_sqe(ring)
+    if sqe is None:
+        liburing.io_uring_submit(ring)
+        sqe = liburing.io_uring_get_sqe(ring)
+    return sqe
+
+# 在固定文件 0（ICMP 套接字）上提交一个接收请求
+def _uring_prep_recv(ring, buffers, slot):
+    sqe = _uring_get_sqe(ring)
+    liburing.io_uring_prep_recv(sqe, 0, buffers[slot])
+    liburing.io_uring_sqe_set_flags(sqe, liburing.IOSQE_FIXED_FILE)
+    sqe.user_data = (slot << 2) | URING_OP_RECV
+
+# 创建 io_uring 并将 ICMP 套接字注册为固定文件（下标 0），在各监测周期间复用。
+# sqpoll 为 True 时由内核线程轮询提交队列，稳态下提交请求无需系统调用；
+# 内核线程空闲超过 sq_thread_idle（liburing 未暴露该参数，使用内核默认的 1 秒）后休眠
+def open_uring(sock, entries, sqpoll=False):
+    ring = liburing.Ring()
+    flags = liburing.IORING_SETUP_CLAMP
+    if sqpoll:
+        flags |= liburing.IORING_SETUP_SQPOLL
+    liburing.io_uring_queue_init(entries, ring, flags)
+    try:
+        # 注册 ICMP 套接字为固定文件，避免每次请求都查找并引用文件描述符
+        files = liburing.FileIndex([sock.fileno()])
+        liburing.io_uring_register_files(ring, files)
+    except OSError:
+        liburing.io_uring_queue_exit(ring)
+        raise
+    return ring
+
+# 使用 io_uring 批量 Ping 所有主机，结果顺序与 ips 一致，resolved 为解析后的 IPv4 地址
+def ping_all_uring(ring, sock, ips, resolved, ping_count, ping_timeout):
+    host_count = len(ips)
+    cqe = liburing.Cqe()
+
+    identifiers = [zlib.crc32(address.encode()) & 0xFFFF if address else 0 for address in resolved]
+    # 无法解析的地址视为不可达
+    addresses = [
+        liburing.Sockaddr(liburing.AF_INET, address, 0) if address is not None else None
+        for address in resolved
+    ]
+    buffers = [bytearray(2048) for _ in range(host_count)]
+    response_times = [[] for _ in range(host_count)]
+    ttls = [None] * host_count
+
+    for _ in range(ping_count):
+        # 本轮中等待应答的请求：序列号 -> 主机下标
+        pending = {}
+        sequences = [0] * host_count
+        # 发送缓冲区在请求完成前必须保持引用
+        packets = [None] * host_count
+        inflight_recvs = 0
+
+        for index, address in enumerate(addresses):
+            if address is None:
+                continue
+            sequence = next(_icmp_sequence) & 0xFFFF
+            sequences[index] = sequence
+            packets[index] = build_icmp_echo(identifiers[index], sequence)
+            pending[sequence] = index
+
+            # 发送请求与接收请求链接在一起，确保接收在发送完成后才开始
+            sqe = _uring_get_sqe(ring)
+            liburing.io_uring_prep_sendto(sqe, 0, packets[index], address)
+            liburing.io_uring_sqe_set_flags(sqe, liburing.IOSQE_FIXED_FILE | liburing.IOSQE_IO_LINK)
+            sqe.user_data = (index << 2) | URING_OP_SEND
+            _uring_prep_recv(ring, buffers, index)
+            inflight_recvs += 1
+
+        # 一次系统调用提交本轮所有请求
+        send_time = time.perf_counter()
+        liburing.io_uring_submit_and_get_events(ring)
+        deadline = send_time + ping_timeout / 1000
+        cancelled = False
+
+        while inflight_recvs:
+            if not cancelled and (not pending or time.perf_counter() >= deadline):
+                # 超时或已全部收到应答，取消套接字上剩余的接收请求
+                sqe = _uring_get_sqe(ring)
+                liburing.io_uring_prep_cancel_fd(
+                    sqe, 0, liburing.IORING_ASYNC_CANCEL_ALL | liburing.IORING_ASYNC_CANCEL_FD_FIXED
+                )
+                sqe.user_data = URING_OP_CANCEL
+                liburing.io_uring_submit(ring)
+                cancelled = True
+                # 等待取消完成同样有时限，避免取消失败时无限期阻塞事件循环
+                deadline = time.perf_counter() + ping_timeout / 1000
 
-        for future in concurrent.futures.as_completed(future_to_host):
-            hostname, ip = future_to_host[future]
             try:
-                ip, reachable, details = future.result()
-                if not reachable:
-                    monitor_ips.failure_count[ip] += 1
-                    if monitor_ips.failure_count[ip] >= failure_threshold:
-                        # 日志中显示的失败次数为累计值
-                        logged_failure_count = monitor_ips.failure_count[ip]
-                        logging.warning(
-                            f"主机 {hostname} (IP: {ip}) 不可达（监测失败次数: {logged_failure_count}）"
-                        )
-                        # 将告警主机添加到告警列表
-                        alert_list.append((hostname, ip, logged_failure_count))
-                else:
-                    # 如果可达，重置失败次数
-                    monitor_ips.failure_count[ip] = 0
-                    # 记录成功信息
-                    response_time = details.get("response_time", "未知")
-                    ttl = details.get("ttl", "未知")
-                    logging.info(f"主机 {hostname} (IP: {ip}) 可达 - 响应时间: {response_time}ms, TTL: {ttl}")
-            except Exception as e:
-                logging.error(f"Ping 主机 {hostname} (IP: {ip}) 时发生错误: {e}")
+                liburing.io_uring_wait_cqes(ring, cqe, 1, liburing.timespec(max(0, deadline - time.perf_counter())))
+            except OSError as e:
+                if e.errno == errno.ETIME and cancelled:
+                    raise OSError(errno.ETIMEDOUT, "等待 io_uring 取消接收请求超时") from e
+                if e.errno in (errno.ETIME, errno.EINTR):
+                    continue
+                raise
+
+            # 批量处理已完成的 CQE（CqeIter 会正确处理完成队列的回绕）
+            recv_time = time.perf_counter()
+            reaped = 0
+            rearm = False
+            for _ in liburing.CqeIter(ring, cqe):
+                reaped += 1
+                entry = cqe[0]
+                op, slot = entry.user_data & 0x3, entry.user_data >> 2
+                result = _uring_cqe_result(entry)
+                if op == URING_OP_SEND:
+                    if result < 0:
+                        # 发送失败（如网络不可达），不再等待该请求的应答
+                        pending.pop(sequences[slot], None)
+                    continue
+                if op == URING_OP_CANCEL:
+                    # 接收请求恰好已全部完成时返回 -ENOENT，其他错误说明无法取消，交由调用方改用 asyncio
+                    if result < 0 and result != -errno.ENOENT:
+                        raise OSError(-result, f"io_uring 取消接收请求失败: {os.strerror(-result)}")
+                    continue
+
+                inflight_recvs -= 1
+                if result > 0:
+                    # recv 不带辅助数据（liburing 的 Msghdr 不支持 msg_control），数据报套接字取不到 TTL
+                    reply = parse_icmp_reply(sock, buffers[slot][:result], ())
+                    if reply is not None:
+                        identifier, sequence, ttl = reply
+                        index = pending.get(sequence)
+                        if index is not None and (sock.type != socket.SOCK_RAW or identifier == identifiers[index]):
+                            del pending[sequence]
+                            response_times[index].append((recv_time - send_time) * 1000)
+                            if ttl is not None:
+                                ttls[index] = ttl
+                # 收到的可能是其他 ICMP 报文，仍有未应答请求时重新提交接收
+                if result != -errno.ECANCELED and pending and not cancelled:
+                    _uring_prep_recv(ring, buffers, slot)
+                    inflight_recvs += 1
+                    rearm = True
+            liburing.io_uring_cq_advance(ring, reaped)
+            if rearm:
+                liburing.io_uring_submit(ring)
+
+    results = []
+    for ip, times, ttl in zip(ips, response_times, ttls):
+        details = {}
+        if times:
+            details["response_time"] = int(sum(times) / len(times))  # 平均响应时间（取整）
+            details["ttl"] = ttl if ttl is not None else "未知"
+        results.append((ip, bool(times), details))
+    return results
+
+# 调用一次 fping 检测所有主机，返回与 ips 顺序一致的结果列表，没有任何统计结果时返回 None
+async def ping_all_fping(fping, ips, ping_count, ping_timeout):
+    # 同一 IP 可能对应多行主机记录
+    indexes_by_ip = {}
+    for index, ip in enumerate(ips):
+        indexes_by_ip.setdefault(ip, []).append(index)
+
+    process = await asyncio.create_subprocess_exec(
+        fping, "-q", "-c", str(ping_count), "-t", str(ping_timeout), *indexes_by_ip,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    # fping 在有主机不可达时返回 1、有无效地址时返回 2，统计结果以输出为准；
+    # 返回 3 及以上（参数错误、无法创建套接字等）说明 fping 本身无法工作
+    _, output = await process.communicate()
+    if process.returncode >= 3:
+        raise OSError(f"fping 退出码 {process.returncode}: {output.decode(errors='replace').strip()}")
+    matches = list(FPING_SUMMARY_RE.finditer(output))
+    if ips and not matches:
+        # 例如所有主机名暂时无法解析，只影响本轮
+        logging.warning(f"fping 没有输出统计结果，本轮改用其他方式进行检测: {output.decode(errors='replace').strip()}")
+        return None
+
+    results = [None] * len(ips)
+    for match in matches:
+        ip = match.group("host").decode()
+        reachable = int(match.group("rcv")) > 0
+        details = {}
+        if reachable:
+            details["response_time"] = int(float(match.group("avg")))  # 平均响应时间（取整）
+            details["ttl"] = "未知"  # fping 的统计输出不包含 TTL
+        for index in indexes_by_ip.get(ip, ()):
+            results[index] = (ip, reachable, details)
+
+    for index, result in enumerate(results):
+        if result is None:
+            # 没有统计行（例如无效的地址，fping 只输出错误信息），与系统 ping 失败一样视为不可达
+            results[index] = (ips[index], False, {})
+    return results
+
+# 在并发数限制下执行单个 Ping 任务，返回 (主机下标, 结果或异常)
+async def _ping_task(semaphore, index, ping_coro):
+    async with semaphore:
+        try:
+            return index, await ping_coro
+        except Exception as e:
+            return index, e
+
+# Ping 所有主机，依次尝试 fping、io_uring、asyncio ICMP 套接字和系统 ping 命令，
+# 按完成顺序逐个产出 (主机在 ips 中的下标, 结果或异常)
+async def ping_hosts(ips, ping_count, ping_timeout, concurrency, uring_sqpoll=False):
+    if not hasattr(ping_hosts, "fping"):
+        # 启动时检测 fping，存在时每轮只需启动一个进程即可检测所有主机
+        ping_hosts.fping = shutil.which("fping")
+        if ping_hosts.fping is not None:
+            logging.info(f"检测到 fping，将使用 {ping_hosts.fping} 进行检测。")
+
+    if ping_hosts.fping is not None:
+        try:
+            results = await ping_all_fping(ping_hosts.fping, ips, ping_count, ping_timeout)
+        except OSError as e:
+            logging.warning(f"调用 fping 失败，改用其他方式进行检测: {e}")
+            ping_hosts.fping = None
+        else:
+            if results is not None:
+                for index, result in enumerate(results):
+                    yield index, result
+                return
+
+    # ICMP 套接字在各监测周期间复用
+    if not hasattr(ping_hosts, "icmp_sock"):
+        ping_hosts.icmp_sock = open_icmp_socket()
+        if ping_hosts.icmp_sock is None:
+            logging.warning("无法创建 ICMP 套接字，将使用系统 ping 命令进行检测。")
+        ping_hosts.uring = None
+        if ping_hosts.icmp_sock is not None and io_uring_available():
+            try:
+                ping_hosts.uring = open_uring(ping_hosts.icmp_sock, max(256, 2 * len(ips)), uring_sqpoll)
+            except OSError as e:
+                # 例如容器禁用了 io_uring
+                logging.warning(f"io_uring 不可用，改用 asyncio 进行检测: {e}")
+
+    if ping_hosts.icmp_sock is not None:
+        # ICMP 套接字按数值地址发送和匹配应答
+        addresses = await resolve_ipv4(ips)
+
+    if ping_hosts.uring is not None:
+        try:
+            # 通过 io_uring 一次性提交所有主机的 ICMP 请求
+            results = ping_all_uring(
+                ping_hosts.uring, ping_hosts.icmp_sock, ips, addresses, ping_count, ping_timeout
+            )
+        except OSError as e:
+            # 环的状态不再可靠，后续周期改用 asyncio
+            logging.warning(f"io_uring 检测出错，改用 asyncio 进行检测: {e}")
+            liburing.io_uring_queue_exit(ping_hosts.uring)
+            ping_hosts.uring = None
+        else:
+            for index, result in enumerate(results):
+                yield index, result
+            return
+
+    semaphore = asyncio.Semaphore(concurrency)
+    sock = ping_hosts.icmp_sock
+
+    if sock is not None:
+        # 在单个线程中通过共享的 ICMP 套接字并发 Ping 所有主机
+        loop = asyncio.get_running_loop()
+        loop.add_reader(sock.fileno(), _on_icmp_readable, sock)
+        try:
+            tasks = [
+                _ping_task(semaphore, index, ping_ip_async(sock, ip, address, ping_count, ping_timeout))
+                for index, (ip, address) in enumerate(zip(ips, addresses))
+            ]
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            loop.remove_reader(sock.fileno())
+        return
+
+    argv_prefix = ping_argv_prefix(ping_count, ping_timeout)
+    tasks = [
+        _ping_task(semaphore, index, ping_ip(argv_prefix, ip))
+        for index, ip in enumerate(ips)
+    ]
+    for next_result in asyncio.as_completed(tasks):
+        yield await next_result
+
+async def monitor_ips(
+    hosts, platforms, ping_count, ping_timeout, failure_threshold, concurrency,
+    persistent_bot=False, uring_sqpoll=False
+):
+    # 失败次数等状态保存在主机表中（跨监测周期），按主机下标访问
+    hostnames, ips, failures = hosts.hostnames, hosts.ips, hosts.failures
+    failed = set()  # 本轮不可达的主机下标
+    info_enabled = logging.getLogger().isEnabledFor(logging.INFO)
+
+    # 结果按完成顺序到达，全部在事件循环线程中处理，无需跨线程同步
+    async for index, result in ping_hosts(ips, ping_count, ping_timeout, concurrency, uring_sqpoll):
+        hostname, ip = hostnames[index], ips[index]
+        if isinstance(result, Exception):
+            # 检测出错的主机按不可达处理，否则失败次数不会累加，告警也永远不会发出；
+            # 非 OSError 的异常多为程序错误，同时记录堆栈
+            logging.error(
+                "Ping 主机 %s (IP: %s) 时发生错误: %s", hostname, ip, result,
+                exc_info=None if isinstance(result, OSError) else result
+            )
+            result = (ip, False, {})
+
+        _, reachable, details = result
+        hosts.record(index, reachable, details)
+        if not reachable:
+            failed.add(index)
+            if failures[index] >= failure_threshold:
+                # 日志中显示的失败次数为累计值
+                logging.warning("主机 %s (IP: %s) 不可达（监测失败次数: %d）", hostname, ip, failures[index])
+        elif info_enabled:
+            # 记录成功信息，使用 % 格式由 logging 延迟格式化，未启用 INFO 级别时直接跳过
+            logging.info(
+                "主机 %s (IP: %s) 可达 - 响应时间: %sms, TTL: %s",
+                hostname, ip, details.get("response_time", "未知"), details.get("ttl", "未知")
+            )
+
+    # 按主机表顺序选出本轮不可达且失败次数达到阈值的主机
+    alert_list = [
+        (hostnames[index], ips[index], failures[index])
+        for index in sorted(failed)
+        if failures[index] >= failure_threshold
+    ]
 
     # 如果有告警主机，推送告警消息
     if alert_list:
-        send_alert(alert_list, platforms)
-
-def main():
-    # 清空日志文件
-    with open("ping_monitor.log", "w") as log_file:
-        log_file.write("")  # 清空文件内容
+        await send_alert(alert_list, platforms, persistent_bot)
 
+async def main_async():
     # 加载配置文件
     config = load_config("config.conf")
 
@@ -207,24 +868,59 @@ def main():
     # 读取启用的推送平台
     platforms = config.get("platforms", "enabled", fallback="").strip('[]').replace('"', '').replace("'", '').split(",")
     platforms = [platform.strip() for platform in platforms if platform.strip()]
+    # 是否以常驻进程方式运行 PushBot（需要 PushBot 支持从标准输入逐行读取 JSON 消息）
+    persistent_bot = config.getboolean("platforms", "persistent_bot", fallback=False)
 
     # 读取 Ping 配置
     ping_count = int(config.get("ping", "ping_count", fallback=3))  # 默认 Ping 3 次
     ping_timeout = int(config.get("ping", "ping_timeout", fallback=1000))  # 默认超时 1000 毫秒
     failure_threshold = int(config.get("ping", "failure_threshold", fallback=3))  # 默认监测失败 2 次触发告警
-
-    # 从 iplist.csv 文件中加载主机名称和 IP 列表
-    ip_list = load_ips_from_csv("iplist.csv")
-    if not ip_list:
+    concurrency = int(config.get("ping", "concurrency", fallback=50))  # 默认同时 Ping 50 台主机
+    # 是否为 io_uring 启用 SQPOLL 内核轮询线程（默认关闭，对套接字负载不一定有收益）
+    uring_sqpoll = config.getboolean("ping", "io_uring_sqpoll", fallback=False)
+
+    # 从 iplist.csv 文件中加载主机名称和 IP 列表，并记录文件修改时间用于热加载
+    ip_list_mtime = ip_list_mtime_ns("iplist.csv")
+    hosts = load_ips_from_csv("iplist.csv")
+    if not hosts:
         logging.error("iplist.csv 文件中没有有效的主机名称和 IP 地址。")
         return
 
-    # 循环监测
+    # 循环监测，按固定节拍调度，监测本身的耗时不会累积到间隔中
+    next_tick = time.monotonic()
     while True:
+        # 每轮只 stat 一次文件，修改时间变化时才重新读取主机列表，无需重启即可生效
+        mtime = ip_list_mtime_ns("iplist.csv")
+        if mtime != ip_list_mtime:
+            new_hosts = load_ips_from_csv("iplist.csv")
+            if new_hosts:
+                ip_list_mtime = mtime
+                new_hosts.carry_over(hosts)
+                hosts = new_hosts
+                logging.info(f"iplist.csv 已更新，重新加载 {len(hosts)} 台主机。")
+            else:
+                # 文件可能正在保存或暂时不存在，保留原主机列表及失败次数，下一轮再尝试加载
+                logging.error("重新加载 iplist.csv 失败或其中没有有效的主机，继续使用原主机列表。")
+
         logging.info(f"开始新一轮监测，时间: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-        monitor_ips(ip_list, platforms, ping_count, ping_timeout, failure_threshold)
-        logging.info(f"监测完成，等待 {interval} 秒...")
-        time.sleep(interval)  # 根据配置的间隔时间等待
+        await monitor_ips(
+            hosts, platforms, ping_count, ping_timeout, failure_threshold, concurrency,
+            persistent_bot, uring_sqpoll
+        )
+
+        next_tick += interval
+        delay = next_tick - time.monotonic()
+        if delay < -interval:
+            # 已错过整整一个节拍，从当前时间重新开始计时，避免连续补跑
+            logging.warning(f"监测耗时超出检测间隔 {interval} 秒过多，将从当前时间重新计时。")
+            next_tick = time.monotonic() + interval
+            delay = interval
+        delay = max(0, delay)
+        logging.info(f"监测完成，等待 {delay:.1f} 秒...")
+        await asyncio.sleep(delay)  # 等待到下一轮监测的开始时间
+
+def main():
+    asyncio.run(main_async())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file